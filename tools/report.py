@@ -10,8 +10,7 @@ Input: JSON Lines file with records like:
   {"type":"end", ...}
 
 Outputs:
-  - report.html
-  - cpu.png, mem.png, swap.png
+  - report.html (plots embedded as base64 data URIs)
   - (optional) raw summary JSON
 
 Usage:
@@ -21,82 +20,245 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import array
 import base64
 import datetime as dt
+import io
 import json
-import math
+import mmap
 import os
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
 from typing import Any, Dict, List, Optional, Tuple
 
-import matplotlib.pyplot as plt
+import numpy as np
+from PIL import Image, ImageDraw
+
+# Prefer a C JSON parser for the per-line hot loop; stdlib json is the
+# always-available fallback. All three raise ValueError on bad input.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    try:
+        from ujson import loads as _json_loads
+    except ImportError:
+        from json import loads as _json_loads
+
+# Optional JIT for the scan kernels; the NumPy paths below are the
+# fallback when numba is not installed.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Optional Parquet cache of parsed columns for repeat reporting.
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
 
 
 # -------------------------
 # Helpers
 # -------------------------
 
-def read_jsonl(path: str) -> Tuple[Optional[dict], List[dict], List[dict], Optional[dict]]:
+_NUMERIC_FIELDS = ("ts", "cpu", "cpu_avg", "mem_used", "mem_avail",
+                   "mem_swap_used", "mem_swap_avail")
+_STATE_FIELDS = ("CPU_STATE", "MEM_STATE")
+
+# State strings are interned to int8 codes at parse time so the scan
+# kernels compare integers instead of strings.
+STATE_OK = 0
+STATE_WARN = 1
+STATE_DANGER = 2
+STATE_UNKNOWN = 3
+_STATE_CODE = {"ok": STATE_OK, "warn": STATE_WARN, "danger": STATE_DANGER}
+
+
+@dataclass
+class Columns:
+    """Structure-of-arrays view of the sample records in a trace."""
+    ts: np.ndarray
+    cpu: np.ndarray
+    cpu_avg: np.ndarray
+    mem_used: np.ndarray
+    mem_avail: np.ndarray
+    mem_swap_used: np.ndarray
+    mem_swap_avail: np.ndarray
+    cpu_state: np.ndarray  # int8 state codes
+    mem_state: np.ndarray  # int8 state codes
+
+
+# Above this file size, JSONL lines are parsed in parallel worker
+# processes; below it, fork/pickle overhead outweighs the gain.
+_PARALLEL_PARSE_BYTES = 50_000_000
+
+
+def parse_trace(path: str) -> Tuple[Optional[dict], Columns, List[dict], Optional[dict]]:
+    """
+    Parse a JSONL trace in a single fused pass.
+
+    Each sample is reduced to its plotted/summarized fields the moment it
+    is parsed, while the dict is still cache-hot, and then dropped.
+    Large files are split on line boundaries and parsed by worker
+    processes — JSONL lines are independent, so the chunks merge by
+    simple concatenation. Returns (meta, columns, events, end).
+    """
+    size = os.path.getsize(path)
+    if size > _PARALLEL_PARSE_BYTES:
+        return _parse_parallel(path, size)
+    return _parse_chunk(path, 0, size)
+
+
+def load_or_parse(path: str) -> Tuple[Optional[dict], Columns, List[dict], Optional[dict]]:
+    """
+    parse_trace with a Parquet cache next to the input file.
+
+    Re-running the report on an unchanged trace (e.g. toggling shading)
+    reads the columns straight from <input>.parquet instead of reparsing
+    the JSONL. meta rides along in the Parquet schema metadata; events
+    and end are not cached (the report does not consume them), so a
+    cache hit returns them empty. Without pyarrow this is parse_trace.
+    """
+    if pa is None:
+        return parse_trace(path)
+
+    cache = path + ".parquet"
+    try:
+        if os.path.getmtime(cache) >= os.path.getmtime(path):
+            table = pq.read_table(cache)
+            cols = Columns(**{f.name: table.column(f.name).to_numpy()
+                              for f in fields(Columns)})
+            meta_raw = (table.schema.metadata or {}).get(b"sysprobe_meta")
+            return json.loads(meta_raw) if meta_raw else None, cols, [], None
+    except (OSError, ValueError, KeyError):
+        # Missing, stale-schema or corrupt cache: fall through and reparse
+        pass
+
+    meta, cols, events, end = parse_trace(path)
+    table = pa.table({f.name: getattr(cols, f.name) for f in fields(Columns)})
+    if meta is not None:
+        table = table.replace_schema_metadata({b"sysprobe_meta": json.dumps(meta).encode()})
+    try:
+        pq.write_table(table, cache)
+    except OSError:
+        pass  # read-only input directory: the cache is best-effort
+    return meta, cols, events, end
+
+
+def _parse_chunk(path: str, start: int, stop: int) -> Tuple[Optional[dict], Columns, List[dict], Optional[dict]]:
+    """Parse lines in [start, stop); both bounds must sit on line breaks."""
     meta = None
-    samples: List[dict] = []
     events: List[dict] = []
     end = None
 
-    with open(path, "r", encoding="utf-8") as f:
-        for line_no, line in enumerate(f, start=1):
+    numeric = {k: array.array("d") for k in _NUMERIC_FIELDS}
+    states = {k: array.array("b") for k in _STATE_FIELDS}
+
+    # Hoisted locals and pre-bound append methods: at 10^6+ lines the
+    # repeated global/attribute lookups in the loop are measurable.
+    numeric_appends = [(k, numeric[k].append) for k in _NUMERIC_FIELDS]
+    state_appends = [(k, states[k].append) for k in _STATE_FIELDS]
+    loads = _json_loads
+    num = _num
+    code_get = _STATE_CODE.get
+    unknown = STATE_UNKNOWN
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return meta, _columns_from_buffers(numeric, states), events, end
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        find = mm.find
+        i = start
+        while i < stop:
+            j = find(b"\n", i)
+            if j == -1:
+                line, i = mm[i:stop], stop
+            else:
+                line, i = mm[i:j], j + 1
             line = line.strip()
             if not line:
                 continue
             try:
-                rec = json.loads(line)
-            except json.JSONDecodeError:
-                # If any non-JSON slips in, skip it rather than failing hard
-                # (but you should aim for pure JSONL on stdout)
+                rec = loads(line)
+            except ValueError:
                 continue
 
-            rtype = rec.get("type")
-            if rtype == "meta" and meta is None:
-                meta = rec
-            elif rtype == "sample":
-                # Require ts
-                if "ts" in rec:
-                    samples.append(rec)
-            elif rtype == "event":
-                if "ts" in rec:
+            t = rec.get("type")
+            if t == "sample":
+                # "k in rec" + rec[k] beats rec.get(k): no bound-method
+                # call, and samples are known to be plain dicts here.
+                if "ts" not in rec or rec["ts"] is None:
+                    continue
+                for k, append in numeric_appends:
+                    append(num(rec[k]) if k in rec else _NAN)
+                for k, append in state_appends:
+                    append(code_get(rec[k], unknown) if k in rec else unknown)
+            elif t == "event":
+                if rec.get("ts") is not None:
                     events.append(rec)
-            elif rtype == "end":
+            elif t == "meta":
+                if meta is None:
+                    meta = rec
+            elif t == "end":
                 end = rec
-            else:
-                # Unknown type: ignore
-                pass
 
-    return meta, samples, events, end
+    return meta, _columns_from_buffers(numeric, states), events, end
+
+
+def _parse_parallel(path: str, size: int) -> Tuple[Optional[dict], Columns, List[dict], Optional[dict]]:
+    """Split the file into per-core byte ranges snapped to newlines and
+    parse them concurrently, concatenating the resulting columns."""
+    nproc = min(os.cpu_count() or 1, 8)
+    bounds = [0]
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        for k in range(1, nproc):
+            pos = mm.find(b"\n", size * k // nproc)
+            bounds.append(size if pos == -1 else pos + 1)
+        mm.close()
+    bounds.append(size)
+    # Boundaries all sit on line breaks; dedupe/sort guards against a
+    # split point whose next newline lands past a later split point.
+    bounds = sorted(set(bounds))
+    ranges = list(zip(bounds, bounds[1:]))
+
+    with ProcessPoolExecutor(max_workers=len(ranges)) as ex:
+        futures = [ex.submit(_parse_chunk, path, lo, hi) for lo, hi in ranges]
+        parts = [fut.result() for fut in futures]
+
+    meta = next((m for m, _, _, _ in parts if m is not None), None)
+    end = next((e for _, _, _, e in reversed(parts) if e is not None), None)
+    events = [ev for _, _, evs, _ in parts for ev in evs]
+    cols = Columns(**{
+        f.name: np.concatenate([getattr(part[1], f.name) for part in parts])
+        for f in fields(Columns)
+    })
+    return meta, cols, events, end
+
+
+def _columns_from_buffers(numeric: Dict[str, array.array], states: Dict[str, array.array]) -> Columns:
+    return Columns(
+        **{k: np.asarray(v) for k, v in numeric.items()},
+        cpu_state=np.asarray(states["CPU_STATE"], dtype=np.int8),
+        mem_state=np.asarray(states["MEM_STATE"], dtype=np.int8),
+    )
+
 
+_NAN = float("nan")
 
-def safe_float(x: Any, default: float = float("nan")) -> float:
+
+def _num(v: Any) -> float:
+    """Coerce a JSON scalar to float; NaN for missing/invalid values."""
+    if isinstance(v, (int, float)):
+        return v
+    if v is None:
+        return _NAN
     try:
-        return float(x)
-    except Exception:
-        return default
-
-
-def percentile(vals: List[float], p: float) -> float:
-    """p in [0, 100]"""
-    clean = sorted(v for v in vals if not (math.isnan(v) or math.isinf(v)))
-    if not clean:
-        return float("nan")
-    if p <= 0:
-        return clean[0]
-    if p >= 100:
-        return clean[-1]
-    k = (len(clean) - 1) * (p / 100.0)
-    f = math.floor(k)
-    c = math.ceil(k)
-    if f == c:
-        return clean[int(k)]
-    d0 = clean[f] * (c - k)
-    d1 = clean[c] * (k - f)
-    return d0 + d1
+        return float(v)
+    except (TypeError, ValueError):
+        return _NAN
 
 
 @dataclass
@@ -115,53 +277,158 @@ class Summary:
     mem_danger_s: float
 
 
-def compute_time_in_state(ts: List[float], state: List[str], target: str) -> float:
-    """Approximate time spent in a given state using sample-to-sample dt."""
-    if len(ts) < 2:
-        return 0.0
-    total = 0.0
-    for i in range(1, len(ts)):
-        dt_i = ts[i] - ts[i - 1]
-        if state[i - 1] == target:
-            total += max(0.0, dt_i)
-    return total
+def _nanstat(fn, arr: np.ndarray) -> float:
+    """Apply a nan-aware reduction, returning NaN (quietly) on all-NaN input."""
+    if arr.size == 0 or np.isnan(arr).all():
+        return _NAN
+    return float(fn(arr))
 
 
-def shade_state(ax, ts: List[float], state: List[str], label: str, alpha: float = 0.15):
+def compute_summary(cols: Columns) -> Summary:
     """
-    Shade background regions where state == label.
+    Reduce the parsed columns to a Summary: one NaN-aware C-level
+    reduction per statistic, no Python-level passes over the samples.
     """
-    if len(ts) < 2:
-        return
-    start = None
-    for i in range(len(ts)):
-        s = state[i]
-        if s == label and start is None:
-            start = ts[i]
-        if (s != label or i == len(ts) - 1) and start is not None:
-            end = ts[i] if s != label else ts[i]
-            ax.axvspan(start, end, alpha=alpha)
-            start = None
+    ts = cols.ts
+    cpu = cols.cpu
+    n = ts.size
+
+    # Inf would skew the interpolated percentile; treat it like missing data.
+    cpu_finite = np.where(np.isinf(cpu), np.nan, cpu)
+
+    return Summary(
+        runtime_s=float(ts[-1] - ts[0]) if n > 1 else 0.0,
+        n_samples=n,
+        cpu_mean=_nanstat(np.nanmean, cpu),
+        cpu_p95=_nanstat(lambda a: np.nanpercentile(a, 95), cpu_finite),
+        cpu_max=_nanstat(np.nanmax, cpu),
+        mem_avail_min=_nanstat(np.nanmin, cols.mem_avail),
+        mem_used_max=_nanstat(np.nanmax, cols.mem_used),
+        swap_used_max=_nanstat(np.nanmax, cols.mem_swap_used),
+        cpu_warn_s=compute_time_in_state(ts, cols.cpu_state, STATE_WARN),
+        cpu_danger_s=compute_time_in_state(ts, cols.cpu_state, STATE_DANGER),
+        mem_warn_s=compute_time_in_state(ts, cols.mem_state, STATE_WARN),
+        mem_danger_s=compute_time_in_state(ts, cols.mem_state, STATE_DANGER),
+    )
 
 
-def write_html_report(
-    out_path: str,
-    meta: Optional[dict],
-    summary: Summary,
-    plots: Dict[str, str],
-):
+if njit is not None:
+    @njit(cache=True)
+    def _time_in_state_nb(ts, state, target):
+        tot = 0.0
+        for i in range(1, ts.size):
+            if state[i - 1] == target:
+                d = ts[i] - ts[i - 1]
+                if d > 0.0:
+                    tot += d
+        return tot
+
+    @njit(cache=True)
+    def _run_edges_nb(state, target):
+        n = state.size
+        starts = np.empty(n, np.int64)
+        ends = np.empty(n, np.int64)
+        k = 0
+        prev = False
+        for i in range(n):
+            cur = state[i] == target
+            if cur and not prev:
+                starts[k] = i
+            elif prev and not cur:
+                ends[k] = i
+                k += 1
+            prev = cur
+        if prev:
+            ends[k] = n
+            k += 1
+        return starts[:k], ends[:k]
+
+
+def compute_time_in_state(ts: np.ndarray, state: np.ndarray, target: int) -> float:
+    """Approximate time spent in a given state using sample-to-sample dt."""
+    if ts.size < 2:
+        return 0.0
+    if njit is not None:
+        return float(_time_in_state_nb(ts, state, target))
+    dts = np.maximum(np.diff(ts), 0.0)
+    return float(dts[state[:-1] == target].sum())
+
+
+def state_runs(ts: np.ndarray, state: np.ndarray, label: int) -> List[Tuple[float, float]]:
     """
-    plots: mapping name -> relative filename (png)
+    Return (t_start, t_end) pairs of contiguous runs where state == label
+    (an int8 state code).
+
+    Runs are found with a vectorized edge scan: pad the match mask with
+    False on both sides, diff it, and read run starts/ends off the edges.
+    This also closes a run that extends to the final sample.
     """
-    title = "sysprobe report"
-    created = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    if ts.size < 2:
+        return []
+    if njit is not None:
+        starts, ends = _run_edges_nb(state, label)
+    else:
+        m = np.concatenate(([False], state == label, [False]))
+        edges = np.diff(m.astype(np.int8))
+        starts = np.where(edges == 1)[0]
+        ends = np.where(edges == -1)[0]
+    last = ts.size - 1
+    return [(float(ts[s]), float(ts[min(e, last)])) for s, e in zip(starts, ends)]
 
-    meta_pretty = json.dumps(meta, indent=2) if meta else "{}"
 
-    def row(k: str, v: str) -> str:
-        return f"<tr><td><b>{k}</b></td><td>{v}</td></tr>"
+# Line traces longer than this are thinned with LTTB before plotting;
+# below it, matplotlib's own cost is negligible.
+_LTTB_THRESHOLD = 4000
+
+
+def lttb(ts: np.ndarray, ys: np.ndarray, n_out: int = 2000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Largest-Triangle-Three-Buckets downsampling for plotting.
 
-    html = f"""<!doctype html>
+    Keeps the first and last point and, per bucket, the point forming the
+    largest triangle with the previously kept point and the next bucket's
+    mean — far fewer line segments for matplotlib with the visual shape
+    preserved. Render-time thinning only; summaries use the full arrays.
+    """
+    n = ts.size
+    if n_out >= n or n_out < 3:
+        return ts, ys
+
+    bounds = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    out_t = np.empty(n_out)
+    out_y = np.empty(n_out)
+    out_t[0], out_y[0] = ts[0], ys[0]
+    out_t[-1], out_y[-1] = ts[-1], ys[-1]
+
+    a_t, a_y = ts[0], ys[0]
+    for k in range(n_out - 2):
+        lo = bounds[k]
+        hi = max(bounds[k + 1], lo + 1)
+        nxt_lo = bounds[k + 1]
+        nxt_hi = bounds[k + 2] if k + 3 < n_out else n
+        nxt_hi = max(nxt_hi, nxt_lo + 1)
+        avg_t = ts[nxt_lo:nxt_hi].mean()
+        avg_y = ys[nxt_lo:nxt_hi].mean()
+        area = np.abs((a_t - avg_t) * (ys[lo:hi] - a_y)
+                      - (a_t - ts[lo:hi]) * (avg_y - a_y))
+        # NaN points never win a bucket (matplotlib breaks the line anyway)
+        idx = lo + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        out_t[k + 1] = a_t = ts[idx]
+        out_y[k + 1] = a_y = ys[idx]
+
+    return out_t, out_y
+
+
+def _thin(ts: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Downsample a line trace for plotting when it is long enough to matter."""
+    if ts.size > _LTTB_THRESHOLD:
+        return lttb(ts, ys)
+    return ts, ys
+
+
+# Rendered once per report with a single .format_map; the braces in the
+# CSS block are doubled to survive formatting.
+_HTML_TEMPLATE = """<!doctype html>
 <html>
 <head>
   <meta charset="utf-8"/>
@@ -183,25 +450,25 @@ def write_html_report(
 
   <h2>Summary</h2>
   <table>
-    {row("Runtime (s)", f"{summary.runtime_s:.3f}")}
-    {row("Samples", str(summary.n_samples))}
-    {row("CPU mean (%)", f"{summary.cpu_mean:.2f}")}
-    {row("CPU p95 (%)", f"{summary.cpu_p95:.2f}")}
-    {row("CPU max (%)", f"{summary.cpu_max:.2f}")}
-    {row("Mem avail min (GB)", f"{summary.mem_avail_min:.2f}")}
-    {row("Mem used max (GB)", f"{summary.mem_used_max:.2f}")}
-    {row("Swap used max (GB)", f"{summary.swap_used_max:.2f}")}
-    {row("CPU warn time (s)", f"{summary.cpu_warn_s:.2f}")}
-    {row("CPU danger time (s)", f"{summary.cpu_danger_s:.2f}")}
-    {row("MEM warn time (s)", f"{summary.mem_warn_s:.2f}")}
-    {row("MEM danger time (s)", f"{summary.mem_danger_s:.2f}")}
+    <tr><td><b>Runtime (s)</b></td><td>{runtime_s:.3f}</td></tr>
+    <tr><td><b>Samples</b></td><td>{n_samples}</td></tr>
+    <tr><td><b>CPU mean (%)</b></td><td>{cpu_mean:.2f}</td></tr>
+    <tr><td><b>CPU p95 (%)</b></td><td>{cpu_p95:.2f}</td></tr>
+    <tr><td><b>CPU max (%)</b></td><td>{cpu_max:.2f}</td></tr>
+    <tr><td><b>Mem avail min (GB)</b></td><td>{mem_avail_min:.2f}</td></tr>
+    <tr><td><b>Mem used max (GB)</b></td><td>{mem_used_max:.2f}</td></tr>
+    <tr><td><b>Swap used max (GB)</b></td><td>{swap_used_max:.2f}</td></tr>
+    <tr><td><b>CPU warn time (s)</b></td><td>{cpu_warn_s:.2f}</td></tr>
+    <tr><td><b>CPU danger time (s)</b></td><td>{cpu_danger_s:.2f}</td></tr>
+    <tr><td><b>MEM warn time (s)</b></td><td>{mem_warn_s:.2f}</td></tr>
+    <tr><td><b>MEM danger time (s)</b></td><td>{mem_danger_s:.2f}</td></tr>
   </table>
 
   <h2>Plots</h2>
   <div class="grid">
-    <div><h3>CPU</h3><img src="{plots.get('cpu','')}" alt="cpu plot"></div>
-    <div><h3>Memory</h3><img src="{plots.get('mem','')}" alt="mem plot"></div>
-    <div><h3>Swap</h3><img src="{plots.get('swap','')}" alt="swap plot"></div>
+    <div><h3>CPU</h3><img src="{cpu_img}" alt="cpu plot"></div>
+    <div><h3>Memory</h3><img src="{mem_img}" alt="mem plot"></div>
+    <div><h3>Swap</h3><img src="{swap_img}" alt="swap plot"></div>
   </div>
 
   <h2>Meta</h2>
@@ -209,6 +476,25 @@ def write_html_report(
 </body>
 </html>
 """
+
+
+def write_html_report(
+    out_path: str,
+    meta: Optional[dict],
+    summary: Summary,
+    plots: Dict[str, str],
+):
+    """
+    plots: mapping name -> image URI (data: URIs for inline PNGs)
+    """
+    html = _HTML_TEMPLATE.format_map(summary.__dict__ | {
+        "title": "sysprobe report",
+        "created": dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "meta_pretty": json.dumps(meta, indent=2) if meta else "{}",
+        "cpu_img": plots.get("cpu", ""),
+        "mem_img": plots.get("mem", ""),
+        "swap_img": plots.get("swap", ""),
+    })
     with open(out_path, "w", encoding="utf-8") as f:
         f.write(html)
 
@@ -217,6 +503,170 @@ def write_html_report(
 # Main plotting/report
 # -------------------------
 
+# Chart geometry and colors for the Pillow renderer. These are three
+# simple line charts; matplotlib's transform/font machinery dominated
+# their render time, so they are drawn directly instead.
+_CHART_W, _CHART_H = 960, 720
+_MARGIN_L, _MARGIN_R, _MARGIN_T, _MARGIN_B = 78, 24, 24, 64
+_PALETTE = ((31, 119, 180), (255, 127, 14))
+_SHADE_RGB = (31, 119, 180)
+_GRID_RGB = (230, 230, 230)
+
+
+def _ticks(lo: float, hi: float, n: int = 5) -> np.ndarray:
+    """Tick positions in [lo, hi] with a 1/2/5 step."""
+    if not (np.isfinite(lo) and np.isfinite(hi)) or hi <= lo:
+        return np.asarray([lo])
+    raw = (hi - lo) / n
+    mag = 10.0 ** np.floor(np.log10(raw))
+    step = next(m * mag for m in (1.0, 2.0, 5.0, 10.0) if raw <= m * mag)
+    first = np.ceil(lo / step) * step
+    return np.arange(first, hi + step * 0.5, step)
+
+
+def _render_chart_bytes(
+    series: List[Tuple[str, np.ndarray, np.ndarray]],
+    xlabel: str,
+    ylabel: str,
+    shade_runs: List[Tuple[float, float, float]] = (),
+) -> bytes:
+    """
+    Draw a line chart with Pillow and return the encoded PNG bytes.
+
+    series: (label, ts, ys) triples, drawn in palette order; NaN values
+    break the line the way matplotlib gaps them.
+    shade_runs: (t_start, t_end, alpha) background spans.
+    """
+    W, H = _CHART_W, _CHART_H
+    L, R, T, B = _MARGIN_L, _MARGIN_R, _MARGIN_T, _MARGIN_B
+    img = Image.new("RGB", (W, H), "white")
+    draw = ImageDraw.Draw(img)
+
+    # Data range over finite values only
+    xs = [t[np.isfinite(t)] for _, t, _ in series]
+    ys = [y[np.isfinite(y)] for _, _, y in series]
+    x0 = min((float(v.min()) for v in xs if v.size), default=0.0)
+    x1 = max((float(v.max()) for v in xs if v.size), default=1.0)
+    y0 = min((float(v.min()) for v in ys if v.size), default=0.0)
+    y1 = max((float(v.max()) for v in ys if v.size), default=1.0)
+    if x1 <= x0:
+        x1 = x0 + 1.0
+    if y1 <= y0:
+        y1 = y0 + 1.0
+    pad = 0.05 * (y1 - y0)
+    y0 -= pad
+    y1 += pad
+
+    sx = (W - L - R) / (x1 - x0)
+    sy = (H - T - B) / (y1 - y0)
+
+    def px(x):
+        return L + (x - x0) * sx
+
+    def py(y):
+        return H - B - (y - y0) * sy
+
+    # Shaded state regions sit behind grid and traces
+    if shade_runs:
+        base = img.convert("RGBA")
+        overlay = Image.new("RGBA", (W, H), (0, 0, 0, 0))
+        od = ImageDraw.Draw(overlay)
+        for t_start, t_end, alpha in shade_runs:
+            od.rectangle(
+                [px(t_start), T, px(t_end), H - B],
+                fill=_SHADE_RGB + (int(alpha * 255),),
+            )
+        img = Image.alpha_composite(base, overlay).convert("RGB")
+        draw = ImageDraw.Draw(img)
+
+    # Grid and tick labels
+    for x in _ticks(x0, x1):
+        gx = px(x)
+        draw.line([(gx, T), (gx, H - B)], fill=_GRID_RGB)
+        label = f"{x:g}"
+        draw.text((gx - draw.textlength(label) / 2, H - B + 6), label, fill="black")
+    for y in _ticks(y0, y1):
+        gy = py(y)
+        draw.line([(L, gy), (W - R, gy)], fill=_GRID_RGB)
+        label = f"{y:g}"
+        draw.text((L - draw.textlength(label) - 6, gy - 5), label, fill="black")
+    draw.rectangle([L, T, W - R, H - B], outline="black")
+
+    # Traces, split into contiguous finite segments
+    for ci, (_name, t, y) in enumerate(series):
+        ok = np.isfinite(t) & np.isfinite(y)
+        idx = np.where(ok)[0]
+        if idx.size < 2:
+            continue
+        color = _PALETTE[ci % len(_PALETTE)]
+        for seg in np.split(idx, np.where(np.diff(idx) > 1)[0] + 1):
+            if seg.size < 2:
+                continue
+            pts = list(zip(px(t[seg]).tolist(), py(y[seg]).tolist()))
+            draw.line(pts, fill=color, width=2)
+
+    # Legend, top-right inside the frame
+    lx = W - R - 180
+    ly = T + 10
+    for ci, (name, _t, _y) in enumerate(series):
+        color = _PALETTE[ci % len(_PALETTE)]
+        draw.line([(lx, ly + 5), (lx + 24, ly + 5)], fill=color, width=3)
+        draw.text((lx + 32, ly), name, fill="black")
+        ly += 16
+
+    # Axis labels (y label rendered horizontally, then rotated)
+    draw.text(
+        ((L + W - R) / 2 - draw.textlength(xlabel) / 2, H - B + 28),
+        xlabel, fill="black",
+    )
+    ylab = Image.new("RGB", (int(draw.textlength(ylabel)) + 4, 14), "white")
+    ImageDraw.Draw(ylab).text((2, 1), ylabel, fill="black")
+    ylab = ylab.rotate(90, expand=True)
+    img.paste(ylab, (8, (T + H - B) // 2 - ylab.height // 2))
+
+    # Light zlib compression: encode time dominates, size does not matter
+    buf = io.BytesIO()
+    img.save(buf, "PNG", compress_level=1)
+    return buf.getvalue()
+
+
+def _png_data_uri(png: bytes) -> str:
+    return "data:image/png;base64," + base64.b64encode(png).decode("ascii")
+
+
+def _shade_runs(ts, state) -> List[Tuple[float, float, float]]:
+    return (
+        [(a, b, 0.12) for a, b in state_runs(ts, state, STATE_WARN)]
+        + [(a, b, 0.18) for a, b in state_runs(ts, state, STATE_DANGER)]
+    )
+
+
+def _plot_cpu(ts, cpu, cpu_avg, cpu_state, shade: bool) -> bytes:
+    return _render_chart_bytes(
+        [("cpu (%)", *_thin(ts, cpu)), ("cpu_avg (%)", *_thin(ts, cpu_avg))],
+        xlabel="time (s)",
+        ylabel="cpu (%)",
+        shade_runs=_shade_runs(ts, cpu_state) if shade else (),
+    )
+
+
+def _plot_mem(ts, mem_used, mem_avail, mem_state, shade: bool) -> bytes:
+    return _render_chart_bytes(
+        [("mem_used (GB)", *_thin(ts, mem_used)), ("mem_avail (GB)", *_thin(ts, mem_avail))],
+        xlabel="time (s)",
+        ylabel="GB",
+        shade_runs=_shade_runs(ts, mem_state) if shade else (),
+    )
+
+
+def _plot_swap(ts, swap_used, swap_avail) -> bytes:
+    return _render_chart_bytes(
+        [("swap_used (GB)", *_thin(ts, swap_used)), ("swap_avail (GB)", *_thin(ts, swap_avail))],
+        xlabel="time (s)",
+        ylabel="GB",
+    )
+
+
 def main():
     ap = argparse.ArgumentParser(description="Generate an HTML report from sysprobe JSONL output.")
     ap.add_argument("input", help="Path to sysprobe JSONL output")
@@ -224,108 +674,43 @@ def main():
     ap.add_argument("--no-shading", action="store_true", help="Disable WARN/DANGER background shading")
     args = ap.parse_args()
 
-    meta, samples, events, end = read_jsonl(args.input)
-    if not samples:
+    meta, cols, events, end = load_or_parse(args.input)
+    ts = cols.ts
+    n = ts.size
+    if n == 0:
         raise SystemExit("No sample records found. Ensure stdout contains JSONL with type=sample and a ts field.")
 
     os.makedirs(args.outdir, exist_ok=True)
 
-    # Extract vectors
-    ts = [safe_float(s.get("ts")) for s in samples]
-    cpu = [safe_float(s.get("cpu")) for s in samples]
-    cpu_avg = [safe_float(s.get("cpu_avg")) for s in samples]
-
-    mem_used = [safe_float(s.get("mem_used")) for s in samples]
-    mem_avail = [safe_float(s.get("mem_avail")) for s in samples]
-
-    swap_used = [safe_float(s.get("mem_swap_used")) for s in samples]
-    swap_avail = [safe_float(s.get("mem_swap_avail")) for s in samples]
-
-    cpu_state = [str(s.get("CPU_STATE", "unknown")) for s in samples]
-    mem_state = [str(s.get("MEM_STATE", "unknown")) for s in samples]
-
-    runtime_s = (ts[-1] - ts[0]) if len(ts) > 1 else 0.0
-
-    # Summary stats
-    cpu_mean = sum(v for v in cpu if not math.isnan(v)) / max(1, sum(1 for v in cpu if not math.isnan(v)))
-    cpu_p95 = percentile(cpu, 95)
-    cpu_max = max((v for v in cpu if not math.isnan(v)), default=float("nan"))
-
-    mem_avail_min = min((v for v in mem_avail if not math.isnan(v)), default=float("nan"))
-    mem_used_max = max((v for v in mem_used if not math.isnan(v)), default=float("nan"))
-    swap_used_max = max((v for v in swap_used if not math.isnan(v)), default=float("nan"))
-
-    cpu_warn_s = compute_time_in_state(ts, cpu_state, "warn")
-    cpu_danger_s = compute_time_in_state(ts, cpu_state, "danger")
-    mem_warn_s = compute_time_in_state(ts, mem_state, "warn")
-    mem_danger_s = compute_time_in_state(ts, mem_state, "danger")
-
-    summary = Summary(
-        runtime_s=runtime_s,
-        n_samples=len(samples),
-        cpu_mean=cpu_mean,
-        cpu_p95=cpu_p95,
-        cpu_max=cpu_max,
-        mem_avail_min=mem_avail_min,
-        mem_used_max=mem_used_max,
-        swap_used_max=swap_used_max,
-        cpu_warn_s=cpu_warn_s,
-        cpu_danger_s=cpu_danger_s,
-        mem_warn_s=mem_warn_s,
-        mem_danger_s=mem_danger_s,
-    )
-
-    # Plot: CPU
-    cpu_png = os.path.join(args.outdir, "cpu.png")
-    plt.figure()
-    plt.plot(ts, cpu, label="cpu (%)")
-    plt.plot(ts, cpu_avg, label="cpu_avg (%)")
-    ax = plt.gca()
-    if not args.no_shading:
-        shade_state(ax, ts, cpu_state, "warn", alpha=0.12)
-        shade_state(ax, ts, cpu_state, "danger", alpha=0.18)
-    plt.xlabel("time (s)")
-    plt.ylabel("cpu (%)")
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(cpu_png, dpi=150)
-    plt.close()
-
-    # Plot: Memory
-    mem_png = os.path.join(args.outdir, "mem.png")
-    plt.figure()
-    plt.plot(ts, mem_used, label="mem_used (GB)")
-    plt.plot(ts, mem_avail, label="mem_avail (GB)")
-    ax = plt.gca()
-    if not args.no_shading:
-        shade_state(ax, ts, mem_state, "warn", alpha=0.12)
-        shade_state(ax, ts, mem_state, "danger", alpha=0.18)
-    plt.xlabel("time (s)")
-    plt.ylabel("GB")
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(mem_png, dpi=150)
-    plt.close()
-
-    # Plot: Swap
-    swap_png = os.path.join(args.outdir, "swap.png")
-    plt.figure()
-    plt.plot(ts, swap_used, label="swap_used (GB)")
-    plt.plot(ts, swap_avail, label="swap_avail (GB)")
-    plt.xlabel("time (s)")
-    plt.ylabel("GB")
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(swap_png, dpi=150)
-    plt.close()
-
-    # Write report.html
+    summary = compute_summary(cols)
+
+    # Render the three plots in parallel: each is independent and spends
+    # most of its time rasterizing lines and encoding PNG. The PNGs stay
+    # in memory and are embedded in the HTML as data URIs.
+    shade = not args.no_shading
+
+    # float32 is plenty of precision for pixel coordinates and halves the
+    # bytes pickled to the plot workers; summary math stays float64.
+    def f32(a: np.ndarray) -> np.ndarray:
+        return a.astype(np.float32, copy=False)
+
+    ts32 = f32(ts)
+    jobs = [
+        (_plot_cpu, (ts32, f32(cols.cpu), f32(cols.cpu_avg), cols.cpu_state, shade)),
+        (_plot_mem, (ts32, f32(cols.mem_used), f32(cols.mem_avail), cols.mem_state, shade)),
+        (_plot_swap, (ts32, f32(cols.mem_swap_used), f32(cols.mem_swap_avail))),
+    ]
+    with ProcessPoolExecutor(max_workers=3) as ex:
+        futures = [ex.submit(fn, *fn_args) for fn, fn_args in jobs]
+        cpu_uri, mem_uri, swap_uri = (_png_data_uri(fut.result()) for fut in futures)
+
+    # Write report.html with the plots inlined
     report_html = os.path.join(args.outdir, "report.html")
     write_html_report(
         report_html,
         meta=meta,
         summary=summary,
-        plots={"cpu": "cpu.png", "mem": "mem.png", "swap": "swap.png"},
+        plots={"cpu": cpu_uri, "mem": mem_uri, "swap": swap_uri},
     )
 
     # Also dump summary.json for programmatic use
@@ -334,7 +719,6 @@ def main():
         json.dump(summary.__dict__, f, indent=2)
 
     print(f"Wrote: {report_html}")
-    print(f"Wrote: {cpu_png}, {mem_png}, {swap_png}")
     print(f"Wrote: {summary_json_path}")
 
 